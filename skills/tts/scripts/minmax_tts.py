@@ -9,18 +9,35 @@ Aligned with MiniMax Open Platform docs:
 from __future__ import annotations
 
 import argparse
-import base64
+import binascii
+import concurrent.futures
+import contextlib
+import copy
+import functools
+import hashlib
+import http.client
 import json
 import os
 from pathlib import Path
+import queue
+import shutil
+import string
 import sys
-import urllib.error
+import threading
+import urllib.parse
 import urllib.request
+from typing import BinaryIO, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 
 DEFAULT_ENDPOINT = "https://api.minimaxi.com/v1/t2a_v2"
 DEFAULT_BACKUP_ENDPOINT = "https://api-bj.minimaxi.com/v1/t2a_v2"
 DEFAULT_MODEL = "speech-2.8-hd"
+DEFAULT_CACHE_DIR = "~/.cache/minimax-tts"
 SUPPORTED_MODELS = [
     "speech-2.8-hd",
     "speech-2.8-turbo",
@@ -31,55 +48,141 @@ SUPPORTED_MODELS = [
     "speech-01-hd",
     "speech-01-turbo",
 ]
+HEX_PROBE_LEN = 64
+HEX_PROBE_CHARS = string.hexdigits + string.whitespace
+HEX_PROBE_BYTES = HEX_PROBE_CHARS.encode("ascii")
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+TEXT_SLOT = "\0text\0"
+# Options that never reach the request payload; everything else selects a payload template.
+# A new CLI-only option must be added here too, or main_many builds a template per distinct value.
+NON_PAYLOAD_OPTIONS = frozenset(
+    {
+        "text",
+        "text_file",
+        "output",
+        "endpoint",
+        "backup_endpoint",
+        "hedge_delay",
+        "api_key",
+        "timeout",
+        "connect_timeout",
+        "cache_dir",
+        "direct_io",
+        "no_cache",
+    }
+)
+
+# json.dumps builds a new encoder whenever non-default options are passed; share them.
+_PAYLOAD_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+_ASCII_PAYLOAD_ENCODER = json.JSONEncoder(ensure_ascii=True, separators=(",", ":"))
+
+# Idle keep-alive connections keyed by (scheme, host, port, proxy), reused across calls.
+_CONNECTIONS: dict[tuple[str, str, int | None, str], list[http.client.HTTPConnection]] = {}
 
 
-def parse_args() -> argparse.Namespace:
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> tuple[argparse.ArgumentParser, dict[str, argparse.Action]]:
     parser = argparse.ArgumentParser(description="Call MiniMaxi TTS HTTP API and save audio file.")
-    parser.add_argument("--text", help="Text content to synthesize.")
-    parser.add_argument("--text-file", help="Read text from file.")
-    parser.add_argument("--voice-id", required=True, help="Voice ID (system voice or cloned voice_id).")
-    parser.add_argument("--output", required=True, help="Output audio file path.")
-    parser.add_argument("--format", default="mp3", choices=["mp3", "wav", "flac", "pcm"])
-    parser.add_argument("--model", default=DEFAULT_MODEL, choices=SUPPORTED_MODELS, help="MiniMaxi TTS model.")
-    parser.add_argument("--sample-rate", type=int, default=32000)
-    parser.add_argument("--bitrate", type=int, default=128000)
-    parser.add_argument("--channel", type=int, default=1)
-    parser.add_argument("--speed", type=float, default=1.0)
-    parser.add_argument("--volume", type=float, default=1.0)
-    parser.add_argument("--pitch", type=int, default=0)
-    parser.add_argument("--emotion", default="", help="Optional emotion in voice_setting.")
-    parser.add_argument(
+    actions: dict[str, argparse.Action] = {}
+
+    def add_argument(*name_or_flags: str, **kwargs) -> None:
+        action = parser.add_argument(*name_or_flags, **kwargs)
+        actions[action.dest] = action
+
+    add_argument("--text", help="Text content to synthesize.")
+    add_argument("--text-file", help="Read text from file.")
+    add_argument("--voice-id", required=True, help="Voice ID (system voice or cloned voice_id).")
+    add_argument("--output", required=True, help="Output audio file path.")
+    add_argument("--format", default="mp3", choices=["mp3", "wav", "flac", "pcm"])
+    add_argument("--model", default=DEFAULT_MODEL, choices=SUPPORTED_MODELS, help="MiniMaxi TTS model.")
+    add_argument("--sample-rate", type=int, default=32000)
+    add_argument("--bitrate", type=int, default=128000)
+    add_argument("--channel", type=int, default=1)
+    add_argument("--speed", type=float, default=1.0)
+    add_argument("--volume", type=float, default=1.0)
+    add_argument("--pitch", type=int, default=0)
+    add_argument("--emotion", default="", help="Optional emotion in voice_setting.")
+    add_argument(
         "--language-boost",
         default="",
         help="Optional language_boost. Example: auto / Chinese / English.",
     )
-    parser.add_argument(
+    add_argument(
         "--pronunciation-tone",
         action="append",
         default=[],
         help='Optional pronunciation_dict.tone item. Repeatable. Example: "处理/(chu3)(li3)"',
     )
-    parser.add_argument("--output-format", default="hex", choices=["hex", "url"])
-    parser.add_argument("--subtitle-enable", action="store_true", help="Enable subtitle service (non-stream only).")
-    parser.add_argument("--aigc-watermark", action="store_true", help="Append AIGC watermark to generated audio.")
-    parser.add_argument("--voice-modify-pitch", type=float, default=None)
-    parser.add_argument("--voice-modify-intensity", type=float, default=None)
-    parser.add_argument("--voice-modify-timbre", type=float, default=None)
-    parser.add_argument(
+    add_argument("--output-format", default="hex", choices=["hex", "url"])
+    add_argument("--subtitle-enable", action="store_true", help="Enable subtitle service (non-stream only).")
+    add_argument("--aigc-watermark", action="store_true", help="Append AIGC watermark to generated audio.")
+    add_argument("--voice-modify-pitch", type=float, default=None)
+    add_argument("--voice-modify-intensity", type=float, default=None)
+    add_argument("--voice-modify-timbre", type=float, default=None)
+    add_argument(
         "--endpoint",
         default=os.getenv("MINIMAX_TTS_ENDPOINT", os.getenv("MINMAX_TTS_ENDPOINT", DEFAULT_ENDPOINT)),
     )
-    parser.add_argument(
+    add_argument(
         "--backup-endpoint",
         default=os.getenv("MINIMAX_TTS_BACKUP_ENDPOINT", DEFAULT_BACKUP_ENDPOINT),
         help="Fallback endpoint if primary endpoint fails.",
     )
-    parser.add_argument(
+    add_argument(
+        "--hedge-delay",
+        type=float,
+        default=None,
+        help=(
+            "Opt-in: seconds to wait on the primary endpoint before also racing the backup "
+            "(0 sends both at once; both may be billed). By default the backup is only tried after a failure."
+        ),
+    )
+    add_argument(
         "--api-key",
         default=os.getenv("MINIMAX_API_KEY", os.getenv("MINMAX_API_KEY", "")),
     )
-    parser.add_argument("--timeout", type=int, default=60)
-    return parser.parse_args()
+    add_argument("--timeout", type=int, default=60)
+    add_argument(
+        "--connect-timeout",
+        type=float,
+        default=5.0,
+        help="Seconds allowed to open a connection to an endpoint (--timeout still bounds the response).",
+    )
+    add_argument(
+        "--cache-dir",
+        default=os.getenv("MINIMAX_TTS_CACHE_DIR") or DEFAULT_CACHE_DIR,
+        help="Directory of previously synthesized audio, keyed by account and request payload.",
+    )
+    add_argument(
+        "--direct-io",
+        action="store_true",
+        default=_env_flag("MINIMAX_TTS_DIRECT_IO"),
+        help="Keep written audio out of the OS page cache (useful for batch servers); disables the audio cache.",
+    )
+    add_argument("--no-cache", action="store_true", help="Always call the API and do not cache the result.")
+    return parser, actions
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    return _build_parser()[0]
+
+
+def _actions_by_dest() -> dict[str, argparse.Action]:
+    return _build_parser()[1]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    return _get_parser().parse_args(argv)
+
+
+def default_args() -> argparse.Namespace:
+    parser = _get_parser()
+    # Copy so callers appending to a list default (pronunciation_tone) leave the parser's alone.
+    return argparse.Namespace(**{dest: copy.copy(parser.get_default(dest)) for dest in _actions_by_dest()})
 
 
 def read_text(args: argparse.Namespace) -> str:
@@ -137,11 +240,131 @@ def build_payload(text: str, args: argparse.Namespace) -> dict:
     return payload
 
 
-def call_minimaxi(payload: dict, args: argparse.Namespace) -> dict:
+def payload_template(args: argparse.Namespace) -> tuple[bytes, bytes]:
+    # Encode the payload once with a placeholder text and split around it, so requests
+    # that share these options only have to encode their own text.
+    encoded = _PAYLOAD_ENCODER.encode(build_payload(TEXT_SLOT, args))
+    head, _, tail = encoded.partition(_PAYLOAD_ENCODER.encode(TEXT_SLOT))
+    return head.encode("utf-8"), tail.encode("utf-8")
+
+
+def render_payload(template: tuple[bytes, bytes], text: str) -> bytes:
+    head, tail = template
+    if text.isascii():
+        # The escaping encoder has a faster C path and always emits pure ASCII.
+        encoded_text = _ASCII_PAYLOAD_ENCODER.encode(text).encode("ascii")
+    else:
+        encoded_text = _PAYLOAD_ENCODER.encode(text).encode("utf-8")
+    return b"".join((head, encoded_text, tail))
+
+
+def _proxy_for(url: urllib.parse.SplitResult) -> urllib.parse.SplitResult | None:
+    proxy = urllib.request.getproxies().get(url.scheme)
+    if not proxy or urllib.request.proxy_bypass(url.hostname or ""):
+        return None
+    return urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+
+
+def _proxy_headers(proxy_url: urllib.parse.SplitResult) -> dict[str, str]:
+    if not proxy_url.username:
+        return {}
+    credentials = f"{urllib.parse.unquote(proxy_url.username)}:{urllib.parse.unquote(proxy_url.password or '')}"
+    token = binascii.b2a_base64(credentials.encode("utf-8"), newline=False).decode("ascii")
+    return {"Proxy-Authorization": f"Basic {token}"}
+
+
+def _open_connection(
+    url: urllib.parse.SplitResult, proxy_url: urllib.parse.SplitResult | None, timeout: float
+) -> http.client.HTTPConnection:
+    conn_cls = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+    if proxy_url is None:
+        return conn_cls(url.hostname, url.port, timeout=timeout)
+
+    # Like urllib, dial the proxy on its own scheme's default port, not the target's.
+    proxy_port = proxy_url.port or (443 if proxy_url.scheme == "https" else 80)
+    if url.scheme == "http":
+        # Plain-http targets are sent to the proxy as absolute-form requests (see _http_post).
+        return http.client.HTTPConnection(proxy_url.hostname, proxy_port, timeout=timeout)
+    conn = conn_cls(proxy_url.hostname, proxy_port, timeout=timeout)
+    conn.set_tunnel(url.hostname, url.port, headers=_proxy_headers(proxy_url))
+    return conn
+
+
+def _http_post(
+    endpoint: str, body: bytes, headers: dict[str, str], timeout: float, connect_timeout: float
+) -> tuple[int, bytes]:
+    url = urllib.parse.urlsplit(endpoint)
+    if url.scheme not in ("http", "https"):
+        raise ValueError(f"Unsupported endpoint scheme: {endpoint}")
+    target = (url.path or "/") + (f"?{url.query}" if url.query else "")
+    proxy_url = _proxy_for(url)
+    if proxy_url is not None and url.scheme == "http":
+        target = urllib.parse.urlunsplit((url.scheme, url.netloc, url.path or "/", url.query, ""))
+        headers = {**headers, **_proxy_headers(proxy_url)}
+    key = (url.scheme, url.hostname or "", url.port, proxy_url.netloc if proxy_url else "")
+    idle = _CONNECTIONS.setdefault(key, [])
+
+    while True:
+        try:
+            conn, reused = idle.pop(), True
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+        except IndexError:
+            conn, reused = _open_connection(url, proxy_url, connect_timeout), False
+        try:
+            if not reused:
+                # Fail fast on unreachable hosts so the backup endpoint takes over sooner.
+                conn.connect()
+                conn.sock.settimeout(timeout)
+            conn.request("POST", target, body=body, headers=headers)
+            resp = conn.getresponse()
+        except (http.client.RemoteDisconnected, BrokenPipeError):
+            conn.close()
+            if reused:
+                # The server dropped an idle keep-alive connection before answering, so the
+                # request was never handled; retry it once on a fresh connection.
+                continue
+            raise
+        except Exception:
+            conn.close()
+            raise
+        try:
+            data = resp.read()
+        except Exception:
+            # The server may already have processed this (billed) request; don't resend it.
+            conn.close()
+            raise
+
+        if resp.will_close:
+            conn.close()
+        else:
+            idle.append(conn)
+        return resp.status, data
+
+
+def _attempt_endpoint(
+    endpoint: str,
+    body: bytes,
+    headers: dict[str, str],
+    timeout: float,
+    connect_timeout: float,
+    results: queue.SimpleQueue,
+) -> None:
+    try:
+        status, raw = _http_post(endpoint, body, headers, timeout, connect_timeout)
+        if status < 400:
+            results.put((json.loads(raw), None))
+            return
+        details = raw.decode("utf-8", errors="ignore")
+        results.put((None, RuntimeError(f"HTTP {status} @ {endpoint}: {details}")))
+    except Exception as exc:
+        results.put((None, RuntimeError(f"Request failed @ {endpoint}: {exc}")))
+
+
+def call_minimaxi(body: bytes, args: argparse.Namespace) -> dict:
     if not args.api_key:
         raise ValueError("Missing API key. Set MINIMAX_API_KEY (or legacy MINMAX_API_KEY).")
 
-    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
     headers = {
         "Authorization": f"Bearer {args.api_key}",
         "Content-Type": "application/json",
@@ -150,30 +373,84 @@ def call_minimaxi(payload: dict, args: argparse.Namespace) -> dict:
     if args.backup_endpoint and args.backup_endpoint not in endpoints:
         endpoints.append(args.backup_endpoint)
 
+    # Start the primary and fall back to the next endpoint when it fails. With hedge_delay
+    # set, also start the next endpoint once the primary has been silent that long and take
+    # whichever answers first. Attempts run on daemon threads so a slow loser never holds up
+    # process exit.
+    results: queue.SimpleQueue = queue.SimpleQueue()
+    pending = list(endpoints)
+    in_flight = 0
+
+    def launch() -> None:
+        nonlocal in_flight
+        endpoint = pending.pop(0)
+        worker_args = (endpoint, body, headers, args.timeout, min(args.connect_timeout, args.timeout), results)
+        threading.Thread(target=_attempt_endpoint, args=worker_args, daemon=True).start()
+        in_flight += 1
+
+    launch()
     last_error: Exception | None = None
-    for endpoint in endpoints:
-        req = urllib.request.Request(endpoint, data=body, method="POST", headers=headers)
+    while in_flight:
         try:
-            with urllib.request.urlopen(req, timeout=args.timeout) as resp:
-                raw = resp.read().decode("utf-8")
-                return json.loads(raw)
-        except urllib.error.HTTPError as exc:
-            details = exc.read().decode("utf-8", errors="ignore")
-            last_error = RuntimeError(f"HTTP {exc.code} @ {endpoint}: {details}")
-        except Exception as exc:
-            last_error = RuntimeError(f"Request failed @ {endpoint}: {exc}")
+            hedge = pending and args.hedge_delay is not None
+            resp, error = results.get(timeout=max(args.hedge_delay, 0.0) if hedge else None)
+        except queue.Empty:
+            launch()
+            continue
+        in_flight -= 1
+        if error is None:
+            return resp
+        last_error = error
+        if pending:
+            launch()
 
     raise RuntimeError(str(last_error) if last_error else "Unknown request error")
 
 
-def decode_audio_field(audio_value: str) -> bytes:
+def _looks_like_hex(audio_value: str | bytes) -> bool:
+    # Stripping the hex alphabet (plus whitespace) from a short prefix leaves nothing only
+    # if every probed char could be hex; base64 payloads are rejected without a full scan.
+    if isinstance(audio_value, str):
+        return not audio_value[:HEX_PROBE_LEN].strip(HEX_PROBE_CHARS)
+    # Other bytes-like values (memoryview) have no strip(); copying the short probe is cheap.
+    return not bytes(audio_value[:HEX_PROBE_LEN]).strip(HEX_PROBE_BYTES)
+
+
+def decode_audio_field(audio_value: str | bytes) -> bytes:
+    # binascii reads ASCII str and bytes-like input in place, so neither needs converting.
+    if not _looks_like_hex(audio_value):
+        return binascii.a2b_base64(audio_value)
     try:
-        return bytes.fromhex(audio_value)
+        # a2b_hex is a straight table-driven C loop, but unlike bytes.fromhex it rejects
+        # whitespace between byte pairs; fall back to fromhex rather than to base64, which
+        # would happily decode hex digits into garbage audio.
+        return binascii.a2b_hex(audio_value)
     except ValueError:
-        return base64.b64decode(audio_value)
+        if not isinstance(audio_value, str):
+            audio_value = bytes(audio_value).decode("ascii")
+        return bytes.fromhex(audio_value)
+
+
+def prepare_output_path(args: argparse.Namespace) -> Path:
+    output_path = Path(os.path.abspath(os.path.expanduser(args.output)))
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    return output_path
+
 
+@contextlib.contextmanager
+def open_output(output_path: Path, direct_io: bool) -> Iterator[BinaryIO]:
+    with output_path.open("wb") as out:
+        if direct_io and fcntl is not None and hasattr(fcntl, "F_NOCACHE"):
+            fcntl.fcntl(out.fileno(), fcntl.F_NOCACHE, 1)
+        yield out
+        if direct_io and hasattr(os, "posix_fadvise"):
+            # Only clean pages can be dropped, so flush them to disk first.
+            out.flush()
+            os.fdatasync(out.fileno())
+            os.posix_fadvise(out.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
 
-def save_audio(resp: dict, args: argparse.Namespace) -> Path:
+
+def save_audio(resp: dict, args: argparse.Namespace) -> tuple[Path, int]:
     base_resp = resp.get("base_resp", {})
     status_code = base_resp.get("status_code", 0)
     if status_code != 0:
@@ -188,37 +465,225 @@ def save_audio(resp: dict, args: argparse.Namespace) -> Path:
     if not audio:
         raise RuntimeError("Response missing data.audio.")
 
-    output_path = Path(args.output).expanduser().resolve()
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
+    output_path = prepare_output_path(args)
     if args.output_format == "url":
-        with urllib.request.urlopen(audio, timeout=args.timeout) as downloaded:
-            content = downloaded.read()
+        nbytes = 0
+        # Stream into a sibling file and swap it in only once the download is complete, so a
+        # failure mid-stream never truncates or half-writes an existing output. Swap it in at
+        # the symlink's target, so a symlinked --output is written through like in hex mode.
+        target_path = Path(os.path.realpath(output_path))
+        part_path = target_path.with_name(f"{target_path.name}.{os.getpid()}.{threading.get_ident()}.part")
+        try:
+            with urllib.request.urlopen(audio, timeout=args.timeout) as downloaded:
+                with open_output(part_path, args.direct_io) as out:
+                    while chunk := downloaded.read(DOWNLOAD_CHUNK_SIZE):
+                        out.write(chunk)
+                        nbytes += len(chunk)
+                # Unlike a single read(), chunked reads treat a short body as a clean EOF.
+                expected = downloaded.headers.get("Content-Length")
+                if expected is not None and expected.isdigit() and nbytes != int(expected):
+                    raise RuntimeError(f"Audio download incomplete: got {nbytes} of {expected} bytes.")
+            os.replace(part_path, target_path)
+        finally:
+            part_path.unlink(missing_ok=True)
     else:
         content = decode_audio_field(audio)
+        with open_output(output_path, args.direct_io) as out:
+            nbytes = out.write(content)
+    return output_path, nbytes
 
-    output_path.write_bytes(content)
-    return output_path
+
+def cache_key(body: bytes, args: argparse.Namespace) -> str:
+    # Cloned voice_ids belong to one account, so a shared cache dir must not serve one
+    # account's audio to another: mix in the endpoint and API key ahead of the body.
+    # build_payload fixes the key order, so the encoded request body is already canonical.
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(hashlib.blake2b(f"{args.endpoint}\n{args.api_key}".encode("utf-8")).digest())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def cache_path_for(body: bytes, args: argparse.Namespace) -> Path | None:
+    # Keeping a second, page-cached copy would defeat --direct-io, so the two don't mix.
+    if args.no_cache or args.direct_io or not args.cache_dir:
+        return None
+    return Path(os.path.expanduser(args.cache_dir)) / f"{cache_key(body, args)}.{args.format}"
+
+
+def store_in_cache(output_path: Path, cache_path: Path) -> None:
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(output_path, tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    finally:
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+def fetch_audio(
+    args: argparse.Namespace, template: tuple[bytes, bytes] | None = None
+) -> tuple[dict, dict | None, Path | None]:
+    """Network stage: return (result, API response, cache path); the response is None on a cache hit.
+
+    ``template`` is a ``payload_template(args)`` result that callers may reuse across jobs.
+    """
+    text = read_text(args)
+    body = render_payload(template or payload_template(args), text)
+    cache_path = cache_path_for(body, args)
+    result = {
+        "ok": True,
+        "output_path": "",
+        "voice_id": args.voice_id,
+        "model": args.model,
+        "format": args.format,
+        "bytes": 0,
+        "trace_id": None,
+        "usage_characters": None,
+        "cached": False,
+    }
+
+    if cache_path is not None and cache_path.is_file():
+        output_path = prepare_output_path(args)
+        shutil.copyfile(cache_path, output_path)
+        result.update(output_path=str(output_path), bytes=cache_path.stat().st_size, cached=True)
+        return result, None, cache_path
+
+    return result, call_minimaxi(body, args), cache_path
+
+
+def write_audio(args: argparse.Namespace, result: dict, resp: dict | None, cache_path: Path | None) -> dict:
+    """Decode/write stage for the output of ``fetch_audio``."""
+    if resp is None:
+        return result
+
+    output_path, nbytes = save_audio(resp, args)
+    if cache_path is not None:
+        store_in_cache(output_path, cache_path)
+    extra_info = resp.get("extra_info") or {}
+    result.update(
+        output_path=str(output_path),
+        bytes=nbytes,
+        trace_id=resp.get("trace_id"),
+        usage_characters=extra_info.get("usage_characters"),
+    )
+    return result
+
+
+def synthesize(args: argparse.Namespace) -> dict:
+    return write_audio(args, *fetch_audio(args))
+
+
+def _convert_job_value(action: argparse.Action, value):
+    # Mirror what argparse would accept on the command line: strings go through the
+    # option's type, anything else must already be of that type.
+    expected = action.type or str
+    if isinstance(value, str) and expected is not str:
+        return expected(value)
+    if expected is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, expected) or (expected is not bool and isinstance(value, bool)):
+        raise ValueError(f"expected {expected.__name__}")
+    return value
+
+
+def _check_job_option(name: str, value):
+    action = _actions_by_dest()[name]
+    option = action.option_strings[0]
+    try:
+        if value is None:
+            if action.default is not None:
+                raise ValueError("must not be None")
+        elif action.nargs == 0:
+            if not isinstance(value, bool):
+                raise ValueError("expected bool")
+        elif isinstance(action.default, list):
+            if not isinstance(value, (list, tuple)):
+                raise ValueError("expected a list")
+            value = [_convert_job_value(action, item) for item in value]
+        else:
+            value = _convert_job_value(action, value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid job option {name}={value!r} ({option}): {exc}") from None
+    if action.choices is not None and value is not None and value not in action.choices:
+        choices = ", ".join(map(str, action.choices))
+        raise ValueError(f"Invalid job option {name}={value!r} ({option}): choose from {choices}")
+    return value
+
+
+def _job_args(job: dict, defaults: dict) -> argparse.Namespace:
+    unknown = sorted(job.keys() - defaults.keys())
+    if unknown:
+        raise ValueError(f"Unknown job option(s): {', '.join(unknown)}")
+    # Jobs skip argparse, so apply the same type and choices checks the CLI would.
+    checked = {name: _check_job_option(name, value) for name, value in job.items()}
+    # Defaults are shared by every job, so hand each one its own copy of list values.
+    args = argparse.Namespace(**{**{name: copy.copy(value) for name, value in defaults.items()}, **checked})
+    if not args.voice_id or not args.output:
+        raise ValueError("Each job needs voice_id and output.")
+    return args
+
+
+def main_many(jobs: list[dict], workers: int = 4) -> list[dict]:
+    """Synthesize several jobs in one process without going through argparse.
+
+    Each job maps option names as argparse stores them (``text``, ``voice_id``,
+    ``output``, ``speed`` ...) to values; anything omitted takes the CLI default.
+    Up to ``workers`` requests are in flight at once while finished responses are
+    decoded and written on a separate thread, so decode overlaps network waits.
+    Returns one result dict per job, in order, shaped like ``main``'s JSON output.
+    Defaults read from the environment (``MINIMAX_API_KEY``, ``MINIMAX_TTS_CACHE_DIR``,
+    ``MINIMAX_TTS_DIRECT_IO``) are captured once per process when the option parser is
+    first built, so changing them later in a long-running process has no effect; pass
+    ``api_key``, ``cache_dir`` or ``direct_io`` in the job instead.
+    """
+    defaults = vars(default_args())
+    results: list[dict] = [{} for _ in jobs]
+    templates: dict[tuple, tuple[bytes, bytes]] = {}
+    network = concurrent.futures.ThreadPoolExecutor(max_workers=max(workers, 1))
+    disk = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    with network, disk:
+        fetches = {}
+        for index, job in enumerate(jobs):
+            try:
+                args = _job_args(job, defaults)
+                # Jobs overriding the same payload options share one pre-encoded template.
+                template_key = tuple(
+                    (name, tuple(value) if isinstance(value, list) else value)
+                    for name, value in job.items()
+                    if name not in NON_PAYLOAD_OPTIONS
+                )
+                if template_key not in templates:
+                    templates[template_key] = payload_template(args)
+            except Exception as exc:
+                results[index] = {"ok": False, "error": str(exc)}
+                continue
+            fetches[network.submit(fetch_audio, args, templates[template_key])] = (index, args)
+
+        writes = {}
+        for future in concurrent.futures.as_completed(fetches):
+            index, args = fetches[future]
+            try:
+                writes[disk.submit(write_audio, args, *future.result())] = index
+            except Exception as exc:
+                results[index] = {"ok": False, "error": str(exc)}
+
+        for future, index in writes.items():
+            try:
+                results[index] = future.result()
+            except Exception as exc:
+                results[index] = {"ok": False, "error": str(exc)}
+    return results
 
 
 def main() -> int:
     args = parse_args()
     try:
-        text = read_text(args)
-        payload = build_payload(text, args)
-        resp = call_minimaxi(payload, args)
-        output_path = save_audio(resp, args)
-        extra_info = resp.get("extra_info") or {}
-        result = {
-            "ok": True,
-            "output_path": str(output_path),
-            "voice_id": args.voice_id,
-            "model": args.model,
-            "format": args.format,
-            "bytes": output_path.stat().st_size,
-            "trace_id": resp.get("trace_id"),
-            "usage_characters": extra_info.get("usage_characters"),
-        }
+        result = synthesize(args)
         print(json.dumps(result, ensure_ascii=False))
         return 0
     except Exception as exc:
@@ -0,0 +1,430 @@
+from __future__ import annotations
+
+import base64
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+from pathlib import Path
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+import urllib.parse
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "skills" / "tts" / "scripts"))
+
+import minmax_tts  # noqa: E402
+
+
+AUDIO = os.urandom(4096)
+
+
+class RawHTTPServer:
+    """Keep-alive stub that answers each connection's requests from a list of raw replies.
+
+    Each reply is sent for one request; ``None`` closes the connection without answering.
+    After the replies run out the connection is closed.
+    """
+
+    def __init__(self, *connections: list[bytes | None]):
+        self.connections = list(connections)
+        self.requests = 0
+        self.received: list[bytes] = []
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen()
+        self.url = f"http://127.0.0.1:{self.sock.getsockname()[1]}/v1/t2a_v2"
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self) -> None:
+        for replies in self.connections:
+            conn, _ = self.sock.accept()
+            with conn:
+                for reply in replies:
+                    if not self._read_request(conn):
+                        break
+                    if reply is None:
+                        break
+                    conn.sendall(reply)
+
+    def _read_request(self, conn: socket.socket) -> bool:
+        data = b""
+        while b"\r\n\r\n" not in data:
+            chunk = conn.recv(65536)
+            if not chunk:
+                return False
+            data += chunk
+        head, _, body = data.partition(b"\r\n\r\n")
+        self.received.append(head)
+        _, found, rest = head.lower().partition(b"content-length:")
+        length = int(rest.split(b"\r\n")[0]) if found else 0
+        while len(body) < length:
+            body += conn.recv(65536)
+        self.requests += 1
+        return True
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+class TTSStubServer:
+    """Stub TTS API: ``/ok`` answers with hex audio, ``/slow`` after ``delay`` seconds, ``/fail*`` with HTTP 500."""
+
+    def __init__(self, delay: float = 1.0):
+        self.hits: dict[str, int] = {}
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                stub.hits[self.path] = stub.hits.get(self.path, 0) + 1
+                if self.path == "/slow":
+                    time.sleep(delay)
+                if self.path.startswith("/fail"):
+                    status, body = 500, b"boom"
+                else:
+                    resp = {"data": {"audio": AUDIO.hex()}, "trace_id": self.path, "base_resp": {"status_code": 0}}
+                    status, body = 200, json.dumps(resp).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_port}{path}"
+
+    def close(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def close_pooled_connections() -> None:
+    for idle in minmax_tts._CONNECTIONS.values():
+        while idle:
+            idle.pop().close()
+
+
+def http_reply(body: bytes, status: str = "200 OK") -> bytes:
+    return f"HTTP/1.1 {status}\r\nContent-Length: {len(body)}\r\n\r\n".encode("ascii") + body
+
+
+class DecodeAudioFieldTest(unittest.TestCase):
+    def test_hex(self):
+        self.assertEqual(minmax_tts.decode_audio_field(AUDIO.hex()), AUDIO)
+        self.assertEqual(minmax_tts.decode_audio_field(AUDIO.hex().encode("ascii")), AUDIO)
+
+    def test_base64(self):
+        self.assertEqual(minmax_tts.decode_audio_field(base64.b64encode(AUDIO).decode("ascii")), AUDIO)
+        self.assertEqual(minmax_tts.decode_audio_field(base64.b64encode(AUDIO)), AUDIO)
+
+    def test_memoryview(self):
+        self.assertEqual(minmax_tts.decode_audio_field(memoryview(AUDIO.hex().encode("ascii"))), AUDIO)
+        self.assertEqual(minmax_tts.decode_audio_field(memoryview(base64.b64encode(AUDIO))), AUDIO)
+
+    def test_hex_with_whitespace_is_not_decoded_as_base64(self):
+        spaced = " ".join(AUDIO[i : i + 16].hex() for i in range(0, len(AUDIO), 16))
+        self.assertEqual(minmax_tts.decode_audio_field(spaced), AUDIO)
+        self.assertEqual(minmax_tts.decode_audio_field(AUDIO.hex()[:40] + "\n" + AUDIO.hex()[40:]), AUDIO)
+
+    def test_invalid_hex_raises(self):
+        with self.assertRaises(ValueError):
+            minmax_tts.decode_audio_field(AUDIO.hex() + "zz")
+
+
+
+class PayloadTemplateTest(unittest.TestCase):
+    def assertRoundTrips(self, text: str, **options):
+        args = minmax_tts.default_args()
+        args.voice_id = "v"
+        vars(args).update(options)
+        rendered = minmax_tts.render_payload(minmax_tts.payload_template(args), text)
+        self.assertEqual(json.loads(rendered), minmax_tts.build_payload(text, args))
+
+    def test_ascii_text(self):
+        self.assertRoundTrips("Hello, world.")
+
+    def test_non_ascii_text(self):
+        self.assertRoundTrips("你好，世界 👋")
+
+    def test_text_needing_escapes(self):
+        self.assertRoundTrips('say "hi" \\ back\\slash\nnew line\ttab')
+
+    def test_cjk_pronunciation_tone_with_ascii_text(self):
+        self.assertRoundTrips("plain ascii", pronunciation_tone=["处理/(chu3)(li3)"], emotion="happy")
+
+class HttpPostTest(unittest.TestCase):
+    def tearDown(self):
+        close_pooled_connections()
+
+    def post(self, url: str) -> tuple[int, bytes]:
+        return minmax_tts._http_post(url, b"{}", {"Content-Type": "application/json"}, 5, 5)
+
+    def test_stale_keep_alive_connection_is_retried(self):
+        # First connection answers once and then drops without answering the second request.
+        server = RawHTTPServer([http_reply(b"1"), None], [http_reply(b"2")])
+        self.addCleanup(server.close)
+        self.assertEqual(self.post(server.url), (200, b"1"))
+        self.assertEqual(self.post(server.url), (200, b"2"))
+        self.assertEqual(server.requests, 3)
+
+    def test_truncated_response_is_not_resent(self):
+        truncated = b"HTTP/1.1 200 OK\r\nContent-Length: 100\r\n\r\npartial"
+        server = RawHTTPServer([http_reply(b"1"), truncated], [http_reply(b"2")])
+        self.addCleanup(server.close)
+        self.assertEqual(self.post(server.url), (200, b"1"))
+        with self.assertRaises(Exception):
+            self.post(server.url)
+        self.assertEqual(server.requests, 2)
+
+    def test_connect_timeout_does_not_bound_the_response(self):
+        server = TTSStubServer(delay=0.5)
+        self.addCleanup(server.close)
+        status, _ = minmax_tts._http_post(server.url("/slow"), b"{}", {}, 5, 0.1)
+        self.assertEqual(status, 200)
+
+
+class ProxyTest(unittest.TestCase):
+    def tearDown(self):
+        close_pooled_connections()
+
+    def proxy_env(self, proxy: str):
+        return mock.patch.dict(os.environ, {"http_proxy": proxy, "https_proxy": proxy, "no_proxy": ""})
+
+    def test_http_target_is_sent_to_the_proxy_in_absolute_form(self):
+        proxy = RawHTTPServer([http_reply(b"ok")])
+        self.addCleanup(proxy.close)
+        proxy_url = proxy.url.replace("http://", "http://user:secret@").rsplit("/v1", 1)[0]
+        with self.proxy_env(proxy_url):
+            status, data = minmax_tts._http_post("http://api.example:8080/v1/t2a_v2?x=1", b"{}", {}, 5, 5)
+        self.assertEqual((status, data), (200, b"ok"))
+        request = proxy.received[0].decode("ascii")
+        self.assertTrue(request.startswith("POST http://api.example:8080/v1/t2a_v2?x=1 HTTP/1.1\r\n"))
+        self.assertIn("Host: api.example:8080", request)
+        self.assertIn("Proxy-Authorization: Basic " + base64.b64encode(b"user:secret").decode("ascii"), request)
+
+    def test_https_target_is_tunnelled_with_connect(self):
+        proxy = RawHTTPServer([http_reply(b"", status="403 Forbidden")])
+        self.addCleanup(proxy.close)
+        proxy_url = proxy.url.replace("http://", "http://user:secret@").rsplit("/v1", 1)[0]
+        with self.proxy_env(proxy_url), self.assertRaises(OSError):
+            minmax_tts._http_post("https://api.example/v1/t2a_v2", b"{}", {}, 5, 5)
+        request = proxy.received[0].decode("ascii")
+        self.assertTrue(request.startswith("CONNECT api.example:443 HTTP/1."))
+        self.assertIn("Proxy-Authorization: Basic ", request)
+
+    def test_proxy_without_port_uses_the_proxy_scheme_default(self):
+        url = urllib.parse.urlsplit("https://api.example/v1/t2a_v2")
+        for proxy, port in [("http://proxy.example", 80), ("https://proxy.example", 443), ("proxy.example", 80)]:
+            with self.proxy_env(proxy):
+                conn = minmax_tts._open_connection(url, minmax_tts._proxy_for(url), 5)
+            self.assertEqual((conn.host, conn.port), ("proxy.example", port))
+
+
+class SaveAudioTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+
+    def save(self, audio: str, output_format: str) -> tuple[Path, int]:
+        args = minmax_tts.default_args()
+        args.output = str(self.dir / "out.mp3")
+        args.output_format = output_format
+        return minmax_tts.save_audio({"data": {"audio": audio}}, args)
+
+    def test_hex(self):
+        output_path, nbytes = self.save(AUDIO.hex(), "hex")
+        self.assertEqual((output_path.read_bytes(), nbytes), (AUDIO, len(AUDIO)))
+
+    def test_url_download(self):
+        server = RawHTTPServer([http_reply(AUDIO)])
+        self.addCleanup(server.close)
+        output_path, nbytes = self.save(server.url, "url")
+        self.assertEqual((output_path.read_bytes(), nbytes), (AUDIO, len(AUDIO)))
+
+    def test_symlinked_output_is_written_through(self):
+        target = self.dir / "real.mp3"
+        for output_format, audio in [("hex", AUDIO.hex()), ("url", None)]:
+            target.write_bytes(b"old")
+            (self.dir / "out.mp3").unlink(missing_ok=True)
+            (self.dir / "out.mp3").symlink_to(target)
+            if audio is None:
+                server = RawHTTPServer([http_reply(AUDIO)])
+                self.addCleanup(server.close)
+                audio = server.url
+            self.save(audio, output_format)
+            self.assertTrue((self.dir / "out.mp3").is_symlink(), output_format)
+            self.assertEqual(target.read_bytes(), AUDIO, output_format)
+
+    def test_failed_url_download_keeps_existing_output(self):
+        (self.dir / "out.mp3").write_bytes(b"previous")
+        truncated = b"HTTP/1.1 200 OK\r\nContent-Length: 100000\r\n\r\n" + AUDIO[:100]
+        server = RawHTTPServer([truncated])
+        self.addCleanup(server.close)
+        with self.assertRaises(Exception):
+            self.save(server.url, "url")
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()), ["out.mp3"])
+        self.assertEqual((self.dir / "out.mp3").read_bytes(), b"previous")
+
+
+class MainManyValidationTest(unittest.TestCase):
+    def run_job(self, **options) -> dict:
+        job = {"text": "hello", "voice_id": "v", "output": "unused.mp3", "api_key": "", **options}
+        return minmax_tts.main_many([job])[0]
+
+    def assertRejected(self, **options):
+        result = self.run_job(**options)
+        self.assertFalse(result["ok"])
+        self.assertIn("Invalid job option", result["error"])
+
+    def test_rejects_values_the_cli_rejects(self):
+        self.assertRejected(format="ogg")
+        self.assertRejected(model="speech-99")
+        self.assertRejected(output_format="raw")
+        self.assertRejected(speed="fast")
+        self.assertRejected(timeout=1.5)
+        self.assertRejected(subtitle_enable="yes")
+        self.assertRejected(pronunciation_tone="处理/(chu3)(li3)")
+
+    def test_converts_strings_like_the_cli(self):
+        args = minmax_tts._job_args(
+            {"voice_id": "v", "output": "o.mp3", "speed": "1.2", "timeout": "30", "pitch": 2},
+            vars(minmax_tts.default_args()),
+        )
+        self.assertEqual((args.speed, args.timeout, args.pitch), (1.2, 30, 2))
+
+    def test_list_defaults_are_not_shared(self):
+        minmax_tts.default_args().pronunciation_tone.append("处理/(chu3)(li3)")
+        defaults = vars(minmax_tts.default_args())
+        minmax_tts._job_args({"voice_id": "v", "output": "o.mp3"}, defaults).pronunciation_tone.append("x")
+        self.assertEqual(defaults["pronunciation_tone"], [])
+        self.assertEqual(minmax_tts.parse_args(["--voice-id", "v", "--output", "o.mp3"]).pronunciation_tone, [])
+
+
+class CallMinimaxiTest(unittest.TestCase):
+    def setUp(self):
+        self.server = TTSStubServer(delay=1.0)
+        self.addCleanup(self.server.close)
+        self.addCleanup(close_pooled_connections)
+
+    def call(self, primary: str, backup: str, hedge_delay: float | None = None) -> dict:
+        args = minmax_tts.default_args()
+        args.api_key = "key"
+        args.endpoint = self.server.url(primary)
+        args.backup_endpoint = self.server.url(backup)
+        args.hedge_delay = hedge_delay
+        return minmax_tts.call_minimaxi(b"{}", args)
+
+    def test_backup_is_not_raced_by_default(self):
+        self.assertEqual(self.call("/slow", "/ok")["trace_id"], "/slow")
+        self.assertNotIn("/ok", self.server.hits)
+
+    def test_hedge_fires_when_primary_is_slow(self):
+        started = time.monotonic()
+        self.assertEqual(self.call("/slow", "/ok", hedge_delay=0.1)["trace_id"], "/ok")
+        self.assertLess(time.monotonic() - started, 0.9)
+
+    def test_primary_failing_fast_falls_back_without_waiting(self):
+        started = time.monotonic()
+        self.assertEqual(self.call("/fail", "/ok", hedge_delay=30)["trace_id"], "/ok")
+        self.assertLess(time.monotonic() - started, 0.9)
+
+    def test_all_endpoints_failing_raises_last_error(self):
+        with self.assertRaisesRegex(RuntimeError, r"HTTP 500 @ .*/fail-backup: boom"):
+            self.call("/fail", "/fail-backup")
+        self.assertEqual(self.server.hits, {"/fail": 1, "/fail-backup": 1})
+
+
+class MainManyPipelineTest(unittest.TestCase):
+    def test_results_come_back_in_job_order(self):
+        server = TTSStubServer(delay=0.2)
+        self.addCleanup(server.close)
+        self.addCleanup(close_pooled_connections)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        paths = ["/slow", "/ok", "/fail", "/ok"]
+        jobs = [
+            {
+                "text": f"job {index}",
+                "voice_id": "v",
+                "output": str(Path(tmp.name) / f"{index}.mp3"),
+                "endpoint": server.url(path),
+                "backup_endpoint": "",
+                "api_key": "key",
+                "no_cache": True,
+            }
+            for index, path in enumerate(paths)
+        ]
+        results = minmax_tts.main_many(jobs)
+        self.assertEqual([result["ok"] for result in results], [True, True, False, True])
+        self.assertEqual(results[0]["trace_id"], "/slow")
+        self.assertEqual(Path(results[3]["output_path"]).read_bytes(), AUDIO)
+
+
+class AudioCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.server = TTSStubServer()
+        self.addCleanup(self.server.close)
+        self.addCleanup(close_pooled_connections)
+
+    def synthesize(self, api_key: str = "key-a", direct_io: bool = False) -> dict:
+        args = minmax_tts.default_args()
+        args.text = "hello"
+        args.voice_id = "cloned-voice"
+        args.output = str(self.dir / "out.mp3")
+        args.endpoint = self.server.url("/ok")
+        args.backup_endpoint = ""
+        args.api_key = api_key
+        args.cache_dir = str(self.dir / "cache")
+        args.direct_io = direct_io
+        return minmax_tts.synthesize(args)
+
+    def test_hit_is_scoped_to_the_account(self):
+        self.assertFalse(self.synthesize()["cached"])
+        self.assertTrue(self.synthesize()["cached"])
+        self.assertFalse(self.synthesize(api_key="key-b")["cached"])
+        self.assertEqual(self.server.hits["/ok"], 2)
+        self.assertEqual((self.dir / "out.mp3").read_bytes(), AUDIO)
+
+    def test_direct_io_bypasses_the_cache(self):
+        self.assertFalse(self.synthesize(direct_io=True)["cached"])
+        self.assertFalse((self.dir / "cache").exists())
+        self.assertEqual((self.dir / "out.mp3").read_bytes(), AUDIO)
+
+    def test_direct_io_env_flag_is_parsed(self):
+        for value, expected in [("1", True), ("true", True), ("0", False), ("false", False), ("", False)]:
+            with mock.patch.dict(os.environ, {"MINIMAX_TTS_DIRECT_IO": value}):
+                self.assertIs(minmax_tts._env_flag("MINIMAX_TTS_DIRECT_IO"), expected)
+
+    def test_failed_store_leaves_no_temp_file(self):
+        output_path = self.dir / "out.mp3"
+        output_path.write_bytes(AUDIO)
+        cache_path = self.dir / "cache" / "entry.mp3"
+        cache_path.mkdir(parents=True)  # os.replace onto a directory fails
+        minmax_tts.store_in_cache(output_path, cache_path)
+        self.assertEqual(list(cache_path.parent.iterdir()), [cache_path])
+
+    def test_empty_cache_dir_env_uses_default(self):
+        minmax_tts._build_parser.cache_clear()
+        self.addCleanup(minmax_tts._build_parser.cache_clear)
+        with mock.patch.dict(os.environ, {"MINIMAX_TTS_CACHE_DIR": ""}):
+            self.assertEqual(minmax_tts.default_args().cache_dir, minmax_tts.DEFAULT_CACHE_DIR)
+
+
+if __name__ == "__main__":
+    unittest.main()